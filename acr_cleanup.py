@@ -1,16 +1,38 @@
 import sys
 import os
-import json
+import functools
+import hashlib
+import shlex
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from itertools import chain
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime, timedelta, UTC
-from typing import Self
-
-from azure.identity import DefaultAzureCredential, AzureAuthorityHosts
+from typing import Iterable, Iterator
+from uuid import UUID
+
+from azure.identity import (
+    DefaultAzureCredential,
+    AzureAuthorityHosts,
+    TokenCachePersistenceOptions,
+)
 from azure.mgmt.containerservice import ContainerServiceClient
-from azure.mgmt.containerservice.models import RunCommandRequest
-from azure.containerregistry import ContainerRegistryClient
-
-from pydantic import BaseModel, UUID4, Field, ConfigDict
+from azure.mgmt.containerservice.models import Format, RunCommandRequest, RunCommandResult
+from azure.core.polling import LROPoller
+from azure.containerregistry import ContainerRegistryClient, ArtifactTagOrder
+from azure.core.exceptions import ResourceNotFoundError
+from azure.core.pipeline.transport import RequestsTransport
+
+import orjson
+import requests
+import yaml
+from requests.adapters import HTTPAdapter
+from kubernetes.client import CoreV1Api
+from kubernetes.config import new_client_from_config_dict
+from pydantic import BaseModel, UUID4, Field
 
 if os.environ.get("ARM_ENVIRONMENT") == "usgovernment":
     authority = AzureAuthorityHosts.AZURE_GOVERNMENT
@@ -19,51 +41,134 @@ else:
     authority = AzureAuthorityHosts.AZURE_PUBLIC_CLOUD
     resource_manager = "https://management.azure.com"
 
-CREDENTIAL = DefaultAzureCredential(authority=authority)
-CONTAINER_DISCOVERY_COMMAND = '''kubectl get pod --all-namespaces -o jsonpath="{.items[*].spec['initContainers', 'containers'][*].image}"'''
+SNAPSHOT_OVERLAP = timedelta(hours=1)
+HTTP_POOL_SIZE = 64
+# Application ID of the Azure Kubernetes Service Microsoft Entra server, shared by every Entra ID enabled cluster.
+AKS_SERVER_APP_SCOPE = "6dae42f8-4368-4678-94ff-3960e28e3630/.default"
+DISCOVERY_CACHE_DIRECTORY = (
+    Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "acr_cleanup"
+)
+CONTAINER_DISCOVERY_COMMAND = (
+    r"""set -o pipefail; kubectl get pod --all-namespaces -o jsonpath='{range .items[*]}"""
+    r"""{range .spec.initContainers[*]}{.image}{"\n"}{end}"""
+    r"""{range .spec.containers[*]}{.image}{"\n"}{end}"""
+    r"""{end}' | sort -u"""
+)
+CONTAINER_SERVICE_CLIENTS: dict[UUID, ContainerServiceClient] = {}
+CONTAINER_SERVICE_CLIENTS_LOCK = threading.Lock()
+
+
+def get_token_cache_options() -> TokenCachePersistenceOptions | None:
+    """Returns the persistence options of the token cache. Tokens are only persisted encrypted, unless
+    ACR_CLEANUP_ALLOW_UNENCRYPTED_TOKEN_CACHE is set to true to allow a plaintext file where encryption is unavailable.
+
+    Returns:
+        TokenCachePersistenceOptions | None: Persistence options, or None when tokens can't be persisted.
+    """
+    allow_unencrypted_storage = (
+        os.environ.get("ACR_CLEANUP_ALLOW_UNENCRYPTED_TOKEN_CACHE", "").lower() == "true"
+    )
+    # Only Linux can lack encryption (libsecret); Windows and macOS always encrypt the cache.
+    if not allow_unencrypted_storage and sys.platform.startswith("linux"):
+        try:
+            from msal_extensions.libsecret import trial_run
+
+            trial_run()
+        except Exception:
+            print("Token cache encryption is unavailable, tokens will not be persisted between runs.")
+            return None
+    return TokenCachePersistenceOptions(
+        name="acr_cleanup", allow_unencrypted_storage=allow_unencrypted_storage
+    )
 
 
-class TaggedImage(BaseModel):
-    model_config = ConfigDict(frozen=True)
+@functools.cache
+def get_credential() -> DefaultAzureCredential:
+    return DefaultAzureCredential(
+        authority=authority,
+        cache_persistence_options=get_token_cache_options(),
+    )
 
-    registry: str = Field(hash=True)
-    image_name: str = Field(hash=True)
-    image_tag: str = Field(hash=True)
 
-    @classmethod
-    def from_string(cls, payload: str) -> Self:
-        split_tag = payload.split(":")
-        split_slashes = split_tag[0].split("/")
-        registry = "/".join(split_slashes[:-1])
-        image_name = split_slashes[-1]
-        image_tag = split_tag[1]
-        return cls(registry=registry, image_name=image_name, image_tag=image_tag)
+@functools.cache
+def get_transport(pool_size: int) -> RequestsTransport:
+    """Returns the HTTP transport shared by every Azure client using the same pool_size, sized so that concurrent
+    requests don't queue for a connection.
 
-    def __eq__(self, other: Self):
-        return (
-            self.registry == other.registry
-            and self.image_name == other.image_name
-            and self.image_tag == other.image_tag
-        )
+    Args:
+        pool_size (int): Number of connections kept open per host.
 
-    def __lt__(self, other: Self):
-        return (
-            self.registry == other.registry
-            and self.image_name == other.image_name
-            and self.image_tag < other.image_tag
-        )
+    Returns:
+        RequestsTransport: Transport backed by a pooled requests session.
+    """
+    session = requests.Session()
+    session.mount(
+        "https://",
+        HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size),
+    )
+    return RequestsTransport(session=session, session_owner=False)
+
+
+def get_container_service_client(subscription_id: UUID) -> ContainerServiceClient:
+    """Returns the container service client for a subscription, creating it on first use. Clusters that share a
+    subscription share a client, and concurrent callers are serialized so only one client is created per subscription.
+
+    Args:
+        subscription_id (UUID): Subscription containing the Kubernetes clusters.
+
+    Returns:
+        ContainerServiceClient: Client for the subscription.
+    """
+    with CONTAINER_SERVICE_CLIENTS_LOCK:
+        if subscription_id not in CONTAINER_SERVICE_CLIENTS:
+            CONTAINER_SERVICE_CLIENTS[subscription_id] = ContainerServiceClient(
+                credential=get_credential(),
+                base_url=resource_manager,
+                credential_scopes=[resource_manager + "/.default"],
+                subscription_id=str(subscription_id),
+                transport=get_transport(HTTP_POOL_SIZE),
+            )
+        return CONTAINER_SERVICE_CLIENTS[subscription_id]
+
+
+def parse_image_reference(payload: str) -> tuple[str, str, str]:
+    """Splits a tagged image reference such as `myregistry.azurecr.io/my-image:1.0` into its parts.
+
+    Args:
+        payload (str): Image reference to be parsed.
 
-    def __gt__(self, other: Self):
-        return (
-            self.registry == other.registry
-            and self.image_name == other.image_name
-            and self.image_tag > other.image_tag
+    Raises:
+        ValueError: The reference does not include a registry and a tag.
+
+    Returns:
+        tuple[str, str, str]: The registry, image_name, and image_tag of the reference.
+    """
+    remainder, _, image_tag = payload.rpartition(":")
+    registry, _, image_name = remainder.rpartition("/")
+    if not (registry and image_name and image_tag) or "/" in image_tag:
+        raise ValueError(f"'{payload}' is not a tagged image reference!")
+    return registry, image_name, image_tag
+
+
+@dataclass(frozen=True, slots=True, order=True)
+class TaggedImage:
+    registry: str
+    image_name: str
+    image_tag: str
+    _hash: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(
+            self, "_hash", hash((self.registry, self.image_name, self.image_tag))
         )
 
-    def __str__(self):
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __str__(self) -> str:
         return f"{self.registry}/{self.image_name}:{self.image_tag}"
 
-    def __repr__(self):
+    def __repr__(self) -> str:
         return str(self)
 
 
@@ -71,83 +176,369 @@ class KubernetesClusterConfiguration(BaseModel):
     name: str
     subscription_id: UUID4
     resource_group: str
-    _client: ContainerServiceClient = None
+    direct_api: bool = False
+    discovery_cache_ttl: int = Field(default=0, ge=0)
+    _core_v1: CoreV1Api | None = None
 
-    def get_running_images(self, prefix: str = None) -> set[TaggedImage]:
-        if not self._client:
-            self._client = ContainerServiceClient(
-                credential=CREDENTIAL,
-                base_url=resource_manager,
-                credential_scopes=[resource_manager + "/.default"],
-                subscription_id=self.subscription_id,
-            )
-        request = RunCommandRequest(command=CONTAINER_DISCOVERY_COMMAND)
-        response = self._client.managed_clusters.begin_run_command(
-            self.resource_group, self.name, request
-        ).result()
-        running_images = set(response.logs.split(" "))
+    def get_running_images(self, prefix: str | None = None) -> set[tuple[str, str]]:
+        """Returns the (image_name, image_tag) pairs of the images running on the cluster. When discovery_cache_ttl is
+        set, a result recorded less than that many seconds ago is returned without contacting the cluster.
+
+        Args:
+            prefix (str | None, optional): Only images whose reference starts with prefix are returned. Defaults to None.
+
+        Returns:
+            set[tuple[str, str]]: Images running on the cluster.
+
+        Raises:
+            RuntimeError: The discovery command failed on the cluster.
+        """
+        cache_path = self._discovery_cache_path(prefix)
+        if (
+            self.discovery_cache_ttl
+            and cache_path.exists()
+            and time.time() - cache_path.stat().st_mtime < self.discovery_cache_ttl
+        ):
+            try:
+                return {tuple(pair) for pair in orjson.loads(cache_path.read_bytes())}
+            except orjson.JSONDecodeError:
+                print(f"Ignoring unreadable discovery cache {cache_path} for cluster {self.name}.")
+
+        running_image_pairs = self._discover_running_images(prefix)
+
+        # Only reached once discovery succeeded, so a failed run is never cached.
+        if self.discovery_cache_ttl:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            # Write next to cache_path and rename over it, so a concurrent or interrupted run never sees a partial file.
+            with tempfile.NamedTemporaryFile(
+                dir=cache_path.parent, prefix=f".{cache_path.name}.", delete=False
+            ) as cache_file:
+                try:
+                    cache_file.write(orjson.dumps(list(running_image_pairs)))
+                except BaseException:
+                    cache_file.close()
+                    os.unlink(cache_file.name)
+                    raise
+            os.replace(cache_file.name, cache_path)
+        return running_image_pairs
+
+    def _discover_running_images(self, prefix: str | None = None) -> set[tuple[str, str]]:
+        running_images: Iterable[str]
+        if self.direct_api:
+            running_images = get_pod_images(self._list_pods())
+        else:
+            result = self._begin_run_command(prefix).result()
+            if result.exit_code:
+                raise RuntimeError(
+                    f"Image discovery failed on cluster {self.name} (exit code {result.exit_code}): {result.logs}"
+                )
+            running_images = (result.logs or "").splitlines()
+        return {
+            (image_name, image_tag)
+            for r in running_images
+            if prefix is None or r.startswith(prefix)
+            for _, image_name, image_tag in [parse_image_reference(r)]
+        }
+
+    def _discovery_cache_path(self, prefix: str | None = None) -> Path:
+        key = f"{self.subscription_id}/{self.resource_group}/{self.name}/{prefix}"
+        return DISCOVERY_CACHE_DIRECTORY / f"{hashlib.sha1(key.encode()).hexdigest()}.json"
+
+    def _begin_run_command(self, prefix: str | None = None) -> LROPoller[RunCommandResult]:
+        client = get_container_service_client(self.subscription_id)
+        command = CONTAINER_DISCOVERY_COMMAND
         if prefix is not None:
-            running_images = set(
-                [
-                    TaggedImage.from_string(r)
-                    for r in running_images
-                    if r.startswith(prefix)
-                ]
+            # grep exits 1 when no line matches, which is not a failure here.
+            command += f" | {{ grep -F -- {shlex.quote(prefix)} || test $? -eq 1; }}"
+        request = RunCommandRequest(command=command)
+        return client.managed_clusters.begin_run_command(
+            self.resource_group, self.name, request
+        )
+
+    def _list_pods(self) -> dict:
+        """Lists the pods of every namespace straight from the cluster's API server, skipping the run command.
+
+        Returns:
+            dict: Decoded Kubernetes PodList.
+
+        Raises:
+            RuntimeError: The cluster did not return any user credentials.
+        """
+        if not self._core_v1:
+            credentials = get_container_service_client(
+                self.subscription_id
+            ).managed_clusters.list_cluster_user_credentials(
+                self.resource_group, self.name, format=Format.EXEC
             )
-        return running_images
+            if not credentials.kubeconfigs or not credentials.kubeconfigs[0].value:
+                raise RuntimeError(f"No user credentials returned for cluster {self.name}!")
+            kubeconfig = yaml.safe_load(credentials.kubeconfigs[0].value)
+            # Entra ID clusters hand out an exec kubeconfig (pinned above, rather than the legacy azure auth-provider)
+            # that runs an interactive kubelogin device code flow, so authenticate with a token for the AKS server
+            # application from our own credential instead.
+            for user in kubeconfig.get("users", []):
+                if "exec" in user.get("user", {}):
+                    user["user"] = {"token": get_credential().get_token(AKS_SERVER_APP_SCOPE).token}
+            self._core_v1 = CoreV1Api(
+                new_client_from_config_dict(kubeconfig, persist_config=False)
+            )
+        response = self._core_v1.list_pod_for_all_namespaces(_preload_content=False)
+        return orjson.loads(response.data)
+
+
+def get_pod_images(pod_list: dict) -> set[str]:
+    """Returns the unique image references used by the init and regular containers of every pod in a pod list.
 
+    Args:
+        pod_list (dict): Decoded Kubernetes PodList, as returned by the API server.
 
+    Returns:
+        set[str]: Image references used by the pods.
+    """
+    return {
+        container["image"]
+        for pod in pod_list["items"]
+        for container in chain(
+            pod["spec"].get("initContainers", ()), pod["spec"]["containers"]
+        )
+    }
+
+
+@dataclass(frozen=True, slots=True, order=True, repr=False)
 class ContainerRegistryTaggedImage(TaggedImage):
-    created_on: datetime
+    created_on: datetime = field(compare=False)
+
+    __hash__ = TaggedImage.__hash__
+
+
+class RateLimiter:
+    """Spaces calls evenly across every thread sharing the limiter, so that no more than calls are made in any period
+    seconds."""
+
+    def __init__(self, calls: int, period: float) -> None:
+        self._interval = period / calls
+        self._next_call = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        """Blocks until the caller may make its call."""
+        with self._lock:
+            now = time.monotonic()
+            call_at = max(now, self._next_call)
+            self._next_call = call_at + self._interval
+        time.sleep(call_at - now)
+
+
+@dataclass(slots=True)
+class RepositorySnapshot:
+    synced_at: datetime
+    tags: dict[str, datetime]
 
 
 class ContainerRegistryConfiguration(BaseModel):
     url: str
     subscription_id: UUID4
     resource_group: str
-    _client: ContainerRegistryClient = None
+    max_concurrency: int = Field(default=16, gt=0)
+    snapshot_path: Path | None = None
+    max_deletes_per_minute: int | None = Field(default=None, gt=0)
+    _client: ContainerRegistryClient | None = None
+    _snapshot: dict[str, RepositorySnapshot] | None = None
+
+    def load_snapshot(self, path: Path) -> None:
+        """Loads the tags recorded by a previous run, so that only tags updated since then are listed from the registry.
+        A missing snapshot, or one recorded for a different registry, results in a full listing.
+
+        Args:
+            path (Path): Location of the snapshot file.
+        """
+        self._snapshot = {}
+        if not path.exists():
+            return
+        snapshot_raw = orjson.loads(path.read_bytes())
+        if snapshot_raw.get("registry") != self.url:
+            print(f"Ignoring snapshot {path}, it was recorded for another registry.")
+            return
+        for repository_name, repository in snapshot_raw["repositories"].items():
+            self._snapshot[repository_name] = RepositorySnapshot(
+                synced_at=datetime.fromisoformat(repository["synced_at"]),
+                tags={
+                    tag: datetime.fromisoformat(created_on)
+                    for tag, created_on in repository["tags"].items()
+                },
+            )
+        print(
+            f"Loaded snapshot of {len(self._snapshot)} repositories from {path}."
+        )
 
-    def get_stored_images(self) -> set[ContainerRegistryTaggedImage]:
-        """Returns all the images stored within a container registry. Does not return the 'latest' tag.
+    def save_snapshot(self, path: Path) -> None:
+        """Writes the tags known to be in the registry to path for use by the next run.
+
+        Args:
+            path (Path): Location of the snapshot file.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write next to path and rename over it, so an interrupted write never leaves a truncated snapshot behind.
+        with tempfile.NamedTemporaryFile(
+            dir=path.parent, prefix=f".{path.name}.", delete=False
+        ) as snapshot_file:
+            try:
+                snapshot_file.write(
+                    orjson.dumps(
+                        {
+                            "registry": self.url,
+                            "repositories": {
+                                repository_name: {
+                                    "synced_at": repository.synced_at,
+                                    "tags": repository.tags,
+                                }
+                                for repository_name, repository in (self._snapshot or {}).items()
+                            },
+                        }
+                    )
+                )
+            except BaseException:
+                snapshot_file.close()
+                os.unlink(snapshot_file.name)
+                raise
+        os.replace(snapshot_file.name, path)
+
+    def iter_stored_images(
+        self, keep_names: set[str] | None = None
+    ) -> Iterator[ContainerRegistryTaggedImage]:
+        """Yields the images stored within a container registry one repository at a time. Does not yield the 'latest'
+        tag.
+
+        Args:
+            keep_names (set[str] | None): When supplied, only repositories with one of these names have their tags
+                listed. Defaults to listing every repository.
+
+        Yields:
+            ContainerRegistryTaggedImage: Images contained within the registry.
+        """
+        stored_image_count = 0
+        all_repository_names: set[str] = set()
+        repository_names: list[str] = []
+
+        def discover_repository_names() -> Iterator[str]:
+            for repository_name in self._get_client().list_repository_names():
+                all_repository_names.add(repository_name)
+                if keep_names is None or repository_name in keep_names:
+                    repository_names.append(repository_name)
+                    yield repository_name
+
+        # Executor.map submits each repository as soon as its name is paged in, so tag listing overlaps the
+        # remainder of the repository name pagination.
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            for tagged_images in executor.map(
+                self._list_tags, discover_repository_names()
+            ):
+                stored_image_count += len(tagged_images)
+                yield from tagged_images
+        if self._snapshot is not None:
+            for repository_name in self._snapshot.keys() - all_repository_names:
+                del self._snapshot[repository_name]
+        print(
+            f"{stored_image_count} unique container image tags stored across {len(repository_names)} container registry repositories."
+        )
+
+    def _list_tags(self, repository_name: str) -> list[ContainerRegistryTaggedImage]:
+        if self._snapshot is None:
+            tags = {
+                tag.name: tag.created_on
+                for tag in self._get_client().list_tag_properties(
+                    repository=repository_name
+                )
+            }
+        else:
+            tags = self._update_snapshot(self._snapshot, repository_name)
+        return [
+            ContainerRegistryTaggedImage(
+                registry=self.url,
+                image_name=repository_name,
+                image_tag=image_tag,
+                created_on=created_on,
+            )
+            for image_tag, created_on in tags.items()
+            if not image_tag == "latest"
+        ]
+
+    def _update_snapshot(
+        self, snapshot: dict[str, RepositorySnapshot], repository_name: str
+    ) -> dict[str, datetime]:
+        """Lists the tags of a repository newest first, stopping at the first tag that was last updated before the
+        repository's previous snapshot, and merges them into the snapshot.
+
+        Args:
+            snapshot (dict[str, RepositorySnapshot]): Snapshot to be updated, keyed by repository name.
+            repository_name (str): Name of the repository to be listed.
 
         Returns:
-            set[ContainerRegistryTaggedImage]: Images contained within the registry.
+            dict[str, datetime]: Creation time of every tag known to be in the repository.
         """
-        all_images = set()
-        if not self._client:
-            self._client = ContainerRegistryClient(
-                endpoint=f"https://{self.url}", credential=CREDENTIAL
+        synced_at = datetime.now(UTC)
+        previous = snapshot.get(repository_name)
+        tags = {} if previous is None else dict(previous.tags)
+        for tag in self._get_client().list_tag_properties(
+            repository=repository_name,
+            order_by=ArtifactTagOrder.LAST_UPDATED_ON_DESCENDING,
+        ):
+            if (
+                previous is not None
+                and tag.last_updated_on < previous.synced_at - SNAPSHOT_OVERLAP
+            ):
+                break
+            tags[tag.name] = tag.created_on
+        snapshot[repository_name] = RepositorySnapshot(synced_at=synced_at, tags=tags)
+        return tags
+
+    def remove_image(self, image: ContainerRegistryTaggedImage) -> None:
+        print(f"Removing image {image}...")
+        try:
+            self._get_client().delete_manifest(
+                repository=image.image_name, tag_or_digest=image.image_tag
             )
+        except ResourceNotFoundError:
+            print(f"Image {image} was already removed.")
+        if self._snapshot is not None and image.image_name in self._snapshot:
+            self._snapshot[image.image_name].tags.pop(image.image_tag, None)
 
-        for repository_name in self._client.list_repository_names():
-            for tag in self._client.list_tag_properties(repository=repository_name):
-                if not tag.name == "latest":
-                    tagged_image = ContainerRegistryTaggedImage(
-                        registry=self.url,
-                        image_name=repository_name,
-                        image_tag=tag.name,
-                        created_on=tag.created_on,
-                    )
-                    all_images.add(tagged_image)
-        print(
-            f"{len(all_images)} unique container image tags stored in the container registry."
+    def remove_images(self, images: set[ContainerRegistryTaggedImage]) -> None:
+        """Removes the supplied images from the registry, issuing up to max_concurrency deletes at a time and no more
+        than max_deletes_per_minute deletes per minute when that is set.
+
+        Args:
+            images (set[ContainerRegistryTaggedImage]): Images to be removed from the registry.
+        """
+        limiter = (
+            RateLimiter(calls=self.max_deletes_per_minute, period=60)
+            if self.max_deletes_per_minute is not None
+            else None
         )
-        return all_images
 
-    def remove_image(self, image: ContainerRegistryTaggedImage):
+        def remove_image(image: ContainerRegistryTaggedImage) -> None:
+            if limiter is not None:
+                limiter.wait()
+            self.remove_image(image)
+
+        self._get_client()
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            list(executor.map(remove_image, images))
+
+    def _get_client(self) -> ContainerRegistryClient:
         if not self._client:
             self._client = ContainerRegistryClient(
-                endpoint=f"https://{self.url}", credential=CREDENTIAL
+                endpoint=f"https://{self.url}",
+                credential=get_credential(),
+                transport=get_transport(max(self.max_concurrency, HTTP_POOL_SIZE)),
             )
-        self._client.delete_manifest(
-            repository=image.image_name, tag_or_digest=image.image_tag
-        )
+        return self._client
 
 
 def load_configuration(
     config_file_path: Path,
 ) -> tuple[dict[str, KubernetesClusterConfiguration], ContainerRegistryConfiguration]:
-    config_raw = json.loads(config_file_path.read_text())
+    config_raw = orjson.loads(config_file_path.read_bytes())
     kubernetes_cluster_configs = {}
 
     for alias, config in config_raw.get("kubernetes_clusters", {}).items():
@@ -162,109 +553,93 @@ def load_configuration(
 
 
 def get_all_running_images(
-    kubernetes_clusters: list[KubernetesClusterConfiguration],
+    kubernetes_clusters: dict[str, KubernetesClusterConfiguration],
     registry_url: str
-) -> set[TaggedImage]:
+) -> set[tuple[str, str]]:
+    print(f"Retrieving images running on {len(kubernetes_clusters)} clusters...")
     all_running_images = set()
-    for cluster_alias, cluster in kubernetes_clusters.items():
-        print(
-            f"Retrieving images running on cluster {cluster_alias} ({cluster.name})...",
-            end="",
-        )
-        cluster_running_images = cluster.get_running_images(registry_url)
-        print(f"found {len(cluster_running_images)} images.")
-        all_running_images = all_running_images.union(cluster_running_images)
+    with ThreadPoolExecutor(max_workers=max(len(kubernetes_clusters), 1)) as executor:
+        futures = {
+            executor.submit(cluster.get_running_images, registry_url): cluster_alias
+            for cluster_alias, cluster in kubernetes_clusters.items()
+        }
+        for future in as_completed(futures):
+            cluster_alias = futures[future]
+            cluster_running_images = future.result()
+            print(
+                f"Found {len(cluster_running_images)} images running on cluster {cluster_alias} ({kubernetes_clusters[cluster_alias].name})."
+            )
+            all_running_images.update(cluster_running_images)
     print(
         f"Discovered {len(all_running_images)} unique container image tags running across {len(kubernetes_clusters)} clusters."
     )
     return all_running_images
 
 
-def filter_inactive_images(
-    registry_images: set[ContainerRegistryTaggedImage], running_images: set[TaggedImage]
+def select_deletable(
+    registry_images: Iterable[ContainerRegistryTaggedImage],
+    running_images: set[tuple[str, str]],
+    min_age_days: int,
 ) -> set[ContainerRegistryTaggedImage]:
-    """Filters the supplied registry_images using running_images to return images that are not currently in use.
+    """Selects the registry_images that are eligible for cleanup in a single pass.
 
-    If a registry_image's image_name is not found in the set of running images, it will be filtered as well,
-    because we only care to see the images utilized by the Kubernetes clusters. We don't want to remove any
-    images that aren't a part of the Kubernetes deployment.
+    An image is eligible when its image_name is running in at least one Kubernetes cluster, its image_tag is not
+    running in any of them, and it has existed for at least min_age_days whole days. Images whose image_name is not
+    running are never eligible, because we don't want to remove any images that aren't a part of the Kubernetes
+    deployment. The checks are ordered cheapest first, so most images are rejected by a single set lookup.
 
     Args:
-        registry_images (set[ContainerRegistryTaggedImage]): _description_
-        running_images (set[TaggedImage]): _description_
-
-    Returns:
-        set[ContainerRegistryTaggedImage]: _description_
-    """
-    inactive_images = set()
-
-    running_image_map = {i.image_name: set() for i in running_images}
-    for running_image in running_images:
-        if running_image.image_name in running_image_map:
-            running_image_map[running_image.image_name].add(running_image.image_tag)
-
-    for registry_image in registry_images:
-        if registry_image.image_name in running_image_map:
-            if (
-                registry_image.image_tag
-                not in running_image_map[registry_image.image_name]
-            ):
-                inactive_images.add(registry_image)
-
-    return inactive_images
-
-
-def filter_aged_images(
-    registry_images: set[ContainerRegistryTaggedImage], min_age_days: int
-) -> set[ContainerRegistryTaggedImage]:
-    """Filters a set of registry_images based on min_age_days, the number of whole days the image must have existed in
-    order for it to be considered aged and be returned.
-
-    Args:
-        registry_images (set[ContainerRegistryTaggedImage]): Set of images contained within a registry to be evaluated
+        registry_images (Iterable[ContainerRegistryTaggedImage]): Images contained within a registry to be evaluated, which
+            may be streamed from ContainerRegistryConfiguration.iter_stored_images
+        running_images (set[tuple[str, str]]): Set of (image_name, image_tag) pairs running across the Kubernetes
+            clusters
         min_age_days (int): Minimum age in whole days that for the image to be contained in the output
 
     Returns:
-        set[ContainerRegistryTaggedImage]: Images from the running_images input that are sufficiently aged.
+        set[ContainerRegistryTaggedImage]: Images from the registry_images input that are inactive and sufficiently aged.
     """
+    running_image_names = {image_name for image_name, _ in running_images}
 
-    aged_images = set()
-    evaluation_time = datetime.now(UTC)
-    for image in registry_images:
-        age: timedelta = evaluation_time - image.created_on
-        if int(age.total_seconds() // 86400) >= min_age_days:
-            aged_images.add(image)
-    return aged_images
+    cutoff = datetime.now(UTC) - timedelta(days=min_age_days)
+    return {
+        registry_image
+        for registry_image in registry_images
+        if registry_image.image_name in running_image_names
+        and (registry_image.image_name, registry_image.image_tag) not in running_images
+        and registry_image.created_on <= cutoff
+    }
 
 
-def main(config_file: Path, min_age_days: int):
+def main(config_file: Path, min_age_days: int) -> None:
     try:
         kubernetes_clusters, container_registry = load_configuration(
             config_file_path=config_file
         )
     except Exception as e:
         raise RuntimeError("Failed to load configuration!") from e
+    if container_registry.snapshot_path is not None:
+        container_registry.load_snapshot(container_registry.snapshot_path)
     all_running_images = get_all_running_images(kubernetes_clusters=kubernetes_clusters, registry_url=container_registry.url)
-    stored_images = container_registry.get_stored_images()
-    inactive_images = filter_inactive_images(
-        registry_images=stored_images, running_images=all_running_images
-    )
-    print(
-        f"Filtered down to {len(inactive_images)} that have names utilized by Kubernetes and tags that are not currently utilized."
+    running_image_names = {image_name for image_name, _ in all_running_images}
+    aged_images = select_deletable(
+        registry_images=container_registry.iter_stored_images(
+            keep_names=running_image_names
+        ),
+        running_images=all_running_images,
+        min_age_days=min_age_days,
     )
-    aged_images = filter_aged_images(inactive_images, min_age_days=min_age_days)
     print(
-        f"Filtered down to {len(aged_images)} that are sufficiently aged for cleanup."
+        f"Filtered down to {len(aged_images)} that have names utilized by Kubernetes, tags that are not currently utilized, and are sufficiently aged for cleanup."
     )
 
-    for aged_image in aged_images:
-        print(f"Removing image {aged_image}...")
-        container_registry.remove_image(aged_image)
+    container_registry.remove_images(aged_images)
+    if container_registry.snapshot_path is not None:
+        container_registry.save_snapshot(container_registry.snapshot_path)
 
     print(f"Cleanup complete, {len(aged_images)} deleted.")
 
 
-def usage():
+def usage() -> None:
     print(
         """
 acr_cleanup.py 